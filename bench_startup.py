@@ -0,0 +1,88 @@
+"""
+Startup benchmark for Autobot.
+
+Measures how long `import main` takes in a fresh interpreter (what the
+Streamlit app and every uvicorn worker pay on start) and fails if it is
+over budget or if a heavy backend was imported eagerly.
+
+Usage:
+    python bench_startup.py                 # check against the default budget
+    python bench_startup.py --budget 0.8    # custom budget in seconds
+    python bench_startup.py --drivers       # also report first-use cost of each driver
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Seconds allowed for `import main` (median of the runs)
+IMPORT_TIME_BUDGET = float(os.environ.get("AUTOBOT_IMPORT_BUDGET", 1.5))
+
+IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+eager = [m for m in main.LAZY_MODULES if m in sys.modules]
+print(json.dumps({"elapsed": elapsed, "eager": eager}))
+"""
+
+DRIVER_PROBE = """
+import json, time
+import main
+costs = {}
+for name in ["scapy", "ping3", "netmiko", "junos", "junos_config", "lxml_etree"]:
+    driver = getattr(main, name)
+    started = time.perf_counter()
+    ok = driver.available
+    costs[driver.module_name] = round(time.perf_counter() - started, 3) if ok else None
+print(json.dumps(costs))
+"""
+
+def run_probe(code: str) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BASE_DIR, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip())
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Autobot startup benchmark")
+    parser.add_argument("--budget", type=float, default=IMPORT_TIME_BUDGET, help="import budget in seconds")
+    parser.add_argument("--runs", type=int, default=5, help="number of fresh interpreters to measure")
+    parser.add_argument("--drivers", action="store_true", help="report first-use import cost of each driver")
+    args = parser.parse_args()
+
+    samples = []
+    eager = set()
+    for _ in range(args.runs):
+        result = run_probe(IMPORT_PROBE)
+        samples.append(result["elapsed"])
+        eager.update(result["eager"])
+
+    median = statistics.median(samples)
+    print(f"import main: median {median:.3f}s, min {min(samples):.3f}s, max {max(samples):.3f}s "
+          f"over {args.runs} runs (budget {args.budget:.3f}s)")
+
+    if args.drivers:
+        for module_name, cost in run_probe(DRIVER_PROBE).items():
+            print(f"  driver {module_name}: " + (f"{cost:.3f}s on first use" if cost is not None else "not installed"))
+
+    failed = False
+    if eager:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(sorted(eager))}")
+        failed = True
+    if median > args.budget:
+        print(f"FAIL: import time over budget by {median - args.budget:.3f}s")
+        failed = True
+    if not failed:
+        print("OK")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
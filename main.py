@@ -5,24 +5,94 @@ from fastapi import FastAPI, Request, HTTPException, BackgroundTasks
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel
-import scapy.all as scapy
-from ping3 import ping
-from netmiko import ConnectHandler
-try:
-    from jnpr.junos import Device
-    from jnpr.junos.utils.config import Config
-    PYEZ_AVAILABLE = True
-except ImportError:
-    PYEZ_AVAILABLE = False
 import json
 import logging
 from datetime import datetime
 import os
+import re
+import time
+import importlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("Autobot")
 
+class LazyDriver:
+    """
+    Imports a heavy backend module on first use instead of at startup.
+    scapy alone takes seconds to import, so the API, the Streamlit UI and
+    uvicorn workers only pay for the backends a request actually touches.
+    """
+    def __init__(self, module_name: str):
+        self.module_name = module_name
+        self._module = None
+        self._error = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    started = time.perf_counter()
+                    self._module = importlib.import_module(self.module_name)
+                    logger.info(f"Loaded driver {self.module_name} in {time.perf_counter() - started:.2f}s")
+        return self._module
+
+    @property
+    def available(self) -> bool:
+        """
+        True if the module can be imported. Import failures are remembered.
+        """
+        if self._module is None and self._error is None:
+            try:
+                self.load()
+            # scapy/netmiko can also fail with OSError (libpcap, permissions) etc.
+            except Exception as e:
+                self._error = e
+                logger.error(f"Driver {self.module_name} not available: {e}")
+        return self._module is not None
+
+    def __reduce__(self):
+        # Copies/pickles carry only the module name; the lock and module are rebuilt
+        return (LazyDriver, (self.module_name,))
+
+    def __getattr__(self, attr):
+        # Private names (e.g. during copy/pickle, before __init__ ran) must not trigger an import
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self.load(), attr)
+
+# Scanning backends
+scapy = LazyDriver("scapy.all")
+ping3 = LazyDriver("ping3")
+# Device backends
+netmiko = LazyDriver("netmiko")
+junos = LazyDriver("jnpr.junos")
+junos_config = LazyDriver("jnpr.junos.utils.config")
+lxml_etree = LazyDriver("lxml.etree")
+
+# Modules that must not be imported when main.py loads (checked by bench_startup.py)
+LAZY_MODULES = ["scapy", "ping3", "netmiko", "jnpr", "lxml"]
+
+def ping(ip, timeout=4):
+    """
+    ICMP ping via ping3. Returns latency in seconds or None.
+    """
+    return ping3.ping(ip, timeout=timeout)
+
+def pyez_available() -> bool:
+    return junos.available and junos_config.available and lxml_etree.available
+
+async def driver_available(driver: LazyDriver) -> bool:
+    """
+    Loads the driver in a worker thread so a multi-second first import
+    does not freeze the event loop for every client.
+    """
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(None, lambda: driver.available)
+
 app = FastAPI(title="Autobot Network Automation")
 
 # Data structure to hold scan results and logs
@@ -31,6 +101,18 @@ scan_progress = {"status": "idle", "progress": 0, "current_ip": ""}
 logs = []
 CREDENTIALS_FILE = "credentials.json"
 
+# Device facts cache for post-commit verification: {ip: {"facts": {...}, "fetched_at": epoch}}
+device_facts_cache: Dict[str, Dict] = {}
+FACTS_CACHE_TTL = 600
+# Config statements whose commit changes a fact, so cached facts must be refreshed
+FACT_CHANGING_STATEMENTS = ["host-name"]
+# Max devices pushed/verified in parallel during a batch rollout
+MAX_PUSH_WORKERS = 10
+# Leading line of a CLI reply that means the device rejected a verification command
+VERIFY_ERROR_PATTERN = re.compile(r"^\s*(error:|syntax error|unknown command|invalid command)", re.IGNORECASE)
+# Placeholder for a device fact inside an expected value, e.g. {{facts.hostname}}
+FACT_PLACEHOLDER_PATTERN = re.compile(r"\{\{facts\.(\w+)\}\}")
+
 def load_credentials():
     if os.path.exists(CREDENTIALS_FILE):
         with open(CREDENTIALS_FILE, "r") as f:
@@ -59,6 +141,11 @@ class ConfigPushRequest(BaseModel):
     template_values: Optional[Dict[str, str]] = None
     verify_commands: Optional[str] = None
 
+class BatchConfigPushRequest(ConfigPushRequest):
+    target_ip: Optional[str] = None
+    target_ips: List[str]
+    max_workers: int = MAX_PUSH_WORKERS
+
 def get_mac(ip):
     """
     Attempts to get the MAC address for a given IP.
@@ -90,6 +177,8 @@ async def run_arp_scan(ip_list: List[str]) -> Dict[str, str]:
     Returns a dictionary of {ip: mac}.
     """
     found_hosts = {}
+    if not await driver_available(scapy):
+        return found_hosts
     try:
         # Split into smaller chunks to avoid overwhelming the network/scapy
         chunk_size = 50
@@ -128,7 +217,7 @@ async def run_remote_nmap_scan(ip_range: str) -> List[str]:
         logger.info(f"Connecting to Jump Host to run nmap on {base_net}...")
         
         def execute_nmap():
-            with ConnectHandler(**jump_host) as conn:
+            with netmiko.ConnectHandler(**jump_host) as conn:
                 # -sn: Ping scan (no port scan)
                 # -oG -: Grepable output to stdout
                 cmd = f"nmap -sn -oG - {base_net}"
@@ -158,6 +247,11 @@ async def run_ip_scan(ip_list: List[str]):
     current_scan_results = []
     scan_progress["status"] = "running"
     total = len(ip_list)
+
+    if not await driver_available(ping3):
+        logger.error("IP scan aborted: ping3 driver not available.")
+        scan_progress["status"] = "error"
+        return
     
     # 1. Remote Nmap Scan via Jump Host
     is_target_subnet = any(ip.startswith("172.27.14.") for ip in ip_list)
@@ -255,6 +349,8 @@ async def get_scan_status():
 
 @app.get("/api/ping/{ip}")
 async def manual_ping(ip: str):
+    if not await driver_available(ping3):
+        return {"status": "error", "message": "ping3 not installed on server"}
     latency = ping(ip, timeout=1.0)
     if latency is not None:
         return {"status": "success", "latency": f"{latency*1000:.2f}ms"}
@@ -280,52 +376,155 @@ async def delete_creds(group_name: str):
         save_credentials(data)
     return {"status": "success"}
 
-@app.post("/api/push-config")
-async def push_config(request: ConfigPushRequest):
-    global logs
-    log_id = datetime.now().strftime("%H:%M:%S")
-    
+def resolve_credentials(request: ConfigPushRequest):
+    """
+    Returns (username, password), preferring the saved credential group if given.
+    """
     username = request.username
     password = request.password
-    
+
     if request.user_group:
         creds = load_credentials()
         group_data = creds.get(request.user_group)
         if group_data:
             username = group_data["username"]
             password = group_data["password"]
-            
-    if not username or not password:
-        return {"status": "error", "log": f"[{log_id}] ERROR: Credentials missing."}
+    return username, password
 
-    # Handle templating for commands
-    final_commands = request.commands
-    if request.template_values:
-        for key, val in request.template_values.items():
-            final_commands = final_commands.replace(f"{{{{{key}}}}}", val)
+def render_template(text: Optional[str], template_values: Optional[Dict[str, str]]) -> Optional[str]:
+    """
+    Replaces every {{key}} in text with its value.
+    """
+    if text and template_values:
+        for key, val in template_values.items():
+            text = text.replace(f"{{{{{key}}}}}", val)
+    return text
+
+def get_device_facts(dev, ip: str, keys: List[str], refresh: bool = False) -> Dict[str, str]:
+    """
+    Returns the requested facts for the device.
+    Served from cache while fresh so repeated rollouts skip the facts RPCs.
+    refresh=True re-reads them from the device (e.g. after a host-name commit).
+    """
+    if not keys:
+        return {}
+    cached = device_facts_cache.get(ip)
+    if refresh or not cached or time.time() - cached["fetched_at"] >= FACTS_CACHE_TTL:
+        cached = {"facts": {}, "fetched_at": time.time()}
+    missing = [key for key in keys if key not in cached["facts"]]
+    if missing:
+        try:
+            if refresh:
+                dev.facts_refresh(keys=missing)
+            for key in missing:
+                cached["facts"][key] = str(dev.facts.get(key) or "N/A")
+        except Exception as e:
+            logger.error(f"Error gathering facts for {ip}: {e}")
+            return {key: cached["facts"].get(key, "N/A") for key in keys}
+        device_facts_cache[ip] = cached
+    return {key: cached["facts"][key] for key in keys}
+
+def parse_verify_commands(verify_commands: Optional[str]) -> List[Dict[str, Optional[str]]]:
+    """
+    One check per line:
+    - show system uptime                          (passes if the device returns clean output)
+    - show version => {{facts.version}}           (also requires the expected text in the output)
+    - rpc:get-route-engine-information            (runs the RPC instead of a CLI command)
+    Empty lines and lines starting with # are ignored.
+    """
+    checks = []
+    for line in (verify_commands or "").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        command, _, expected = line.partition(" => ")
+        checks.append({"command": command.strip(), "expected": expected.strip() or None})
+    return checks
+
+def run_verify_check(dev, command: str, expected: Optional[str], facts: Dict[str, str]) -> Dict:
+    """
+    Runs a single check on the open session and parses the output into a pass/fail result.
+    """
+    if expected:
+        for key, val in facts.items():
+            expected = expected.replace(f"{{{{facts.{key}}}}}", val)
+    result = {"command": command, "expected": expected, "passed": False, "detail": "", "output": ""}
+
+    try:
+        if command.startswith("rpc:"):
+            rpc_name = command[4:].strip().replace("-", "_")
+            reply = getattr(dev.rpc, rpc_name)()
+            output = reply if isinstance(reply, (str, bool)) else lxml_etree.tostring(reply, encoding="unicode")
+        else:
+            output = dev.cli(command, warning=False)
+    except Exception as e:
+        result["detail"] = f"Execution failed: {str(e)}"
+        return result
+
+    output = str(output or "").strip()
+    result["output"] = output
+    rejected = VERIFY_ERROR_PATTERN.match(output)
+
+    if not output:
+        result["detail"] = "Empty output"
+    elif rejected:
+        result["detail"] = f"Device rejected command: {output.splitlines()[0].strip()}"
+    elif expected and expected not in output:
+        result["detail"] = f"Expected '{expected}' not found"
+    else:
+        result["passed"] = True
+        result["detail"] = f"Found '{expected}'" if expected else "OK"
+    return result
+
+def run_verification(dev, ip: str, verify_commands: Optional[str], log_id: str, output_log: List[str],
+                     facts_changed: bool = False) -> List[Dict]:
+    """
+    Runs the verify commands over the session used for the commit (no reconnect).
+    Only the facts referenced by the checks are fetched.
+    """
+    checks = parse_verify_commands(verify_commands)
+    if not checks:
+        output_log.append(f"[{log_id}] [6/6] VERIFY SKIPPED: No verify commands supplied.")
+        return []
+
+    output_log.append(f"[{log_id}] [6/6] VERIFYING: Running {len(checks)} check(s) on the open session...")
+    fact_keys = sorted({key for check in checks for key in FACT_PLACEHOLDER_PATTERN.findall(check["expected"] or "")})
+    facts = get_device_facts(dev, ip, fact_keys, refresh=facts_changed)
+    results = []
+    for check in checks:
+        result = run_verify_check(dev, check["command"], check["expected"], facts)
+        verdict = "PASS" if result["passed"] else "FAIL"
+        output_log.append(f"[{log_id}] VERIFY {verdict}: {result['command']} ({result['detail']})")
+        results.append(result)
+    return results
 
+def execute_push(target_ip: str, username: str, password: str, final_commands: str,
+                 final_verify: Optional[str]) -> Dict:
+    """
+    Blocking NETCONF push + verification for a single device.
+    Runs in a worker thread so batch rollouts can proceed in parallel.
+    """
+    log_id = datetime.now().strftime("%H:%M:%S")
     output_log = []
-    
-    if not PYEZ_AVAILABLE:
-        return {"status": "error", "log": f"[{log_id}] ERROR: junos-eznc (PyEZ) not installed on server."}
-    
+    verification = []
+    dev = None
+
     try:
-        output_log.append(f"[{log_id}] [1/5] INITIALIZING: Target {request.target_ip}, User: {username}")
+        output_log.append(f"[{log_id}] [1/6] INITIALIZING: Target {target_ip}, User: {username}")
         # gather_facts=False for faster connection
-        dev = Device(host=request.target_ip, user=username, passwd=password, gather_facts=False)
-        
-        output_log.append(f"[{log_id}] [2/5] CONNECTING: Opening NETCONF session to port 830...")
+        dev = junos.Device(host=target_ip, user=username, passwd=password, gather_facts=False)
+
+        output_log.append(f"[{log_id}] [2/6] CONNECTING: Opening NETCONF session to port 830...")
         dev.open()
-        
-        output_log.append(f"[{log_id}] [3/5] CONNECTED: Session established. Fact gathering skipped.")
-        output_log.append(f"[{log_id}] INFO: Device version: {dev.facts.get('version' if dev.facts else 'N/A')}")
-        
+
+        output_log.append(f"[{log_id}] [3/6] CONNECTED: Session established. Fact gathering skipped.")
+
         # Determine format (set or text) based on command prefix
         load_format = "set" if "set " in final_commands.lower() else "text"
-        
-        output_log.append(f"[{log_id}] [4/5] LOADING CONFIG: Parsing commands in '{load_format}' format...")
-        cu = Config(dev)
-        
+
+        output_log.append(f"[{log_id}] [4/6] LOADING CONFIG: Parsing commands in '{load_format}' format...")
+        cu = junos_config.Config(dev)
+
         # Check if config is already in use (lock)
         try:
             cu.lock()
@@ -335,13 +534,12 @@ async def push_config(request: ConfigPushRequest):
 
         cu.load(final_commands, format=load_format)
         output_log.append(f"[{log_id}] SUCCESS: Commands loaded into candidate configuration.")
-        
+
         # Diff check would be great here but let's keep it simple for now
-        
-        output_log.append(f"[{log_id}] [5/5] COMMITTING: Applying changes to active configuration...")
+
+        output_log.append(f"[{log_id}] [5/6] COMMITTING: Applying changes to active configuration...")
         cu.commit()
-        
-        output_log.append(f"[{log_id}] FINAL: Configuration committed and verified.")
+        output_log.append(f"[{log_id}] SUCCESS: Configuration committed.")
 
         try:
             cu.unlock()
@@ -349,10 +547,26 @@ async def push_config(request: ConfigPushRequest):
         except:
             pass
 
+        # e.g. a host-name change makes the cached (and session) facts stale
+        facts_changed = any(stmt in final_commands for stmt in FACT_CHANGING_STATEMENTS)
+        verification = run_verification(dev, target_ip, final_verify, log_id, output_log, facts_changed)
+        failed = [r for r in verification if not r["passed"]]
+        if failed:
+            output_log.append(f"[{log_id}] FINAL: Committed, but {len(failed)}/{len(verification)} verification check(s) failed.")
+        elif verification:
+            output_log.append(f"[{log_id}] FINAL: Configuration committed and verified ({len(verification)} check(s) passed).")
+        else:
+            output_log.append(f"[{log_id}] FINAL: Configuration committed (not verified).")
+
         dev.close()
         output_log.append(f"[{log_id}] STATUS: NETCONF session closed safely.")
-        return {"status": "success", "log": "\n".join(output_log)}
-        
+        return {
+            "target_ip": target_ip,
+            "status": "verify_failed" if failed else "success",
+            "log": "\n".join(output_log),
+            "verification": verification,
+        }
+
     except Exception as e:
         error_msg = f"[{log_id}] !!! FATAL ERROR: {str(e)}"
         output_log.append(error_msg)
@@ -361,7 +575,67 @@ async def push_config(request: ConfigPushRequest):
             dev.close()
         except:
             pass
-        return {"status": "error", "log": "\n".join(output_log)}
+        return {"target_ip": target_ip, "status": "error", "log": "\n".join(output_log), "verification": verification}
+
+@app.post("/api/push-config")
+async def push_config(request: ConfigPushRequest):
+    log_id = datetime.now().strftime("%H:%M:%S")
+    username, password = resolve_credentials(request)
+
+    if not username or not password:
+        return {"status": "error", "log": f"[{log_id}] ERROR: Credentials missing."}
+
+    # First use imports PyEZ; keep that off the event loop
+    loop = asyncio.get_event_loop()
+    if not await loop.run_in_executor(None, pyez_available):
+        return {"status": "error", "log": f"[{log_id}] ERROR: junos-eznc (PyEZ) not installed on server."}
+
+    # Handle templating for commands
+    final_commands = render_template(request.commands, request.template_values)
+    final_verify = render_template(request.verify_commands, request.template_values)
+
+    return await loop.run_in_executor(
+        None, execute_push, request.target_ip, username, password, final_commands, final_verify
+    )
+
+@app.post("/api/push-config/batch")
+async def push_config_batch(request: BatchConfigPushRequest):
+    """
+    Pushes and verifies the same configuration on several devices concurrently.
+    """
+    log_id = datetime.now().strftime("%H:%M:%S")
+    username, password = resolve_credentials(request)
+    # Duplicates would open concurrent sessions committing to the same device
+    target_ips = list(dict.fromkeys(ip.strip() for ip in request.target_ips if ip.strip()))
+
+    if not target_ips:
+        raise HTTPException(status_code=400, detail="No target IPs given")
+
+    if not username or not password:
+        return {"status": "error", "log": f"[{log_id}] ERROR: Credentials missing.", "results": []}
+
+    loop = asyncio.get_event_loop()
+    if not await loop.run_in_executor(None, pyez_available):
+        return {"status": "error", "log": f"[{log_id}] ERROR: junos-eznc (PyEZ) not installed on server.", "results": []}
+
+    final_commands = render_template(request.commands, request.template_values)
+    final_verify = render_template(request.verify_commands, request.template_values)
+
+    workers = max(1, min(request.max_workers, MAX_PUSH_WORKERS, len(target_ips)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = await asyncio.gather(*[
+            loop.run_in_executor(pool, execute_push, ip, username, password, final_commands, final_verify)
+            for ip in target_ips
+        ])
+
+    summary = {status: sum(1 for r in results if r["status"] == status)
+               for status in ["success", "verify_failed", "error"]}
+    logger.info(f"Batch push finished: {summary}")
+    return {
+        "status": "success" if summary["success"] == len(results) else "error",
+        "summary": summary,
+        "results": results,
+    }
 
 @app.get("/")
 async def read_index():
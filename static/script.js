@@ -103,13 +103,13 @@ document.addEventListener('DOMContentLoaded', () => {
             scanPercentage.innerText = `${progress.progress}%`;
             scanStatusText.innerText = progress.status === 'running'
                 ? `Scanning ${progress.current_ip}...`
-                : 'Scan Completed';
+                : (progress.status === 'error' ? 'Scan Failed (scan driver not available)' : 'Scan Completed');
 
             // Update Results Table
             updateTable(data.results);
             state.scanResults = data.results;
 
-            if (progress.status === 'completed') {
+            if (progress.status === 'completed' || progress.status === 'error') {
                 state.isScanning = false;
                 startScanBtn.disabled = false;
                 updateTargetIpList();
@@ -304,6 +304,7 @@ document.addEventListener('DOMContentLoaded', () => {
         const username = document.getElementById('ssh-username').value;
         const password = document.getElementById('ssh-password').value;
         const commands = sshCommands.value;
+        const verifyCommands = document.getElementById('ssh-verify-commands').value;
 
         // Collect template values
         const templateValues = {};
@@ -326,7 +327,7 @@ document.addEventListener('DOMContentLoaded', () => {
                     password: password || null,
                     commands: commands,
                     template_values: templateValues,
-                    verify_commands: null,
+                    verify_commands: verifyCommands.trim() || null,
                     device_type: "juniper_junos"
                 })
             });
@@ -200,6 +200,8 @@ elif menu == "🚀 Config Push":
     with col_r:
         st.subheader("📜 Configuration Template")
         commands = st.text_area("Commands", height=200, placeholder="set system host-name {{hostname}}")
+        verify_commands = st.text_area("Verify Commands (Optional)", height=100,
+                                       placeholder="show system uptime\nshow version => {{facts.version}}")
         
         # Dynamic variable detection
         import re
@@ -246,33 +248,43 @@ elif menu == "🚀 Config Push":
                 # Call backend logic
                 st.info(f"Initiating deployment to {st.session_state.target_ip_final}...")
                 
-                # Iterate through IPs if comma separated
-                ips_to_push = [ip.strip() for ip in st.session_state.target_ip_final.split(",")]
-                
-                for ip in ips_to_push:
-                    st.write(f"Connecting to {ip}...")
-                    # Build request object
-                    req = backend.ConfigPushRequest(
-                        target_ip=ip,
-                        username=st.session_state.cred_info['user'],
-                        password=st.session_state.cred_info['pw'],
-                        user_group=st.session_state.cred_info['group'],
-                        commands=commands,
-                        template_values=template_values
-                    )
-                    
-                    # Run the async function in a sync environment
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    result = loop.run_until_complete(backend.push_config(req))
-                    
+                # Push to every IP concurrently; each device is verified on its own session
+                ips_to_push = [ip.strip() for ip in st.session_state.target_ip_final.split(",") if ip.strip()]
+                req = backend.BatchConfigPushRequest(
+                    target_ips=ips_to_push,
+                    username=st.session_state.cred_info['user'],
+                    password=st.session_state.cred_info['pw'],
+                    user_group=st.session_state.cred_info['group'],
+                    commands=commands,
+                    template_values=template_values,
+                    verify_commands=verify_commands or None
+                )
+
+                # Run the async function in a sync environment
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+                batch = loop.run_until_complete(backend.push_config_batch(req))
+
+                if not batch.get('results'):
+                    st.error("Deployment aborted")
+                    st.text_area("Error Log", value=batch['log'], height=150)
+
+                for result in batch.get('results', []):
+                    ip = result['target_ip']
                     if result['status'] == 'success':
                         st.success(f"Successfully configured {ip}")
                         st.text_area(f"Log for {ip}", value=result['log'], height=150)
+                    elif result['status'] == 'verify_failed':
+                        st.warning(f"Configured {ip}, but verification failed")
+                        st.text_area(f"Log for {ip}", value=result['log'], height=150)
                     else:
                         st.error(f"Failed to configure {ip}")
                         st.text_area(f"Error Log for {ip}", value=result['log'], height=150)
-                
+
+                    if result.get('verification'):
+                        st.dataframe(pd.DataFrame(result['verification'])[['command', 'passed', 'detail']],
+                                     use_container_width=True)
+
                 st.session_state.show_modal = False
 
 elif menu == "🔑 Credentials":